@@ -1,26 +1,182 @@
 import re
-from os import path, makedirs
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from os import path, makedirs, cpu_count
+from types import MappingProxyType
 
+import numpy as np
 from pydub import AudioSegment
 from pydub.playback import play
+try:
+    from numba import njit, types
+except ImportError:
+    # Numba isn't installed, mix with NumPy instead
+    njit = None
+try:
+    import soundfile
+except ImportError:
+    # soundfile isn't installed, export with pydub instead
+    soundfile = None
 
 from .default_oneshots import ONESHOT_PATH
 
 
-class BeatBoxer:
-    oneshots = {
-        'hihat': AudioSegment.from_wav(path.join(ONESHOT_PATH, 'hihat.wav')),
-        'kick': AudioSegment.from_wav(path.join(ONESHOT_PATH, 'kick.wav')),
-        'snare': AudioSegment.from_wav(path.join(ONESHOT_PATH, 'snare.wav')),
-        'clap': AudioSegment.from_wav(path.join(ONESHOT_PATH, 'clap.wav')),
-        'crash': AudioSegment.from_wav(path.join(ONESHOT_PATH, 'crash.wav')),
-        'bass': AudioSegment.from_wav(path.join(ONESHOT_PATH, 'bass.wav'))
-    }
+DEFAULT_ONESHOTS = ('hihat', 'kick', 'snare', 'clap', 'crash', 'bass')
+# Matches the 'every_<nth>' shortcut, grabbing the n
+_EVERY_NTH = re.compile(r'every_(\d+)(?:st|nd|rd|th)$')
+# Beats with fewer samples than this are mixed on a single thread
+_THREADED_MIN_SAMPLES = 1000000
+
+
+@lru_cache(maxsize=None)
+def _load_oneshot(oneshot_path, frame_rate=None, channels=None, gain=0):
+    """
+    Loads the audio file at `oneshot_path` as an int16 array of samples with
+    shape (frames, channels). The result is cached, so each file is only ever
+    decoded once no matter how many BeatBoxer objects use it. The same goes
+    for every variant of it, e.g. with a different gain, since the changes
+    are made here.
+
+    Parameters:
+    oneshot_path - Path to the audio file
+    frame_rate - (default None) Frame rate to convert the audio to. By default,
+                 it keeps the frame rate of the file
+    channels - (default None) Number of channels to convert the audio to. By
+               default, it keeps the channels of the file
+    gain - (default 0) Gain in dB to apply to the audio
+
+    Returns the array, its frame rate and its number of channels.
+    """
+    sound = AudioSegment.from_file(oneshot_path).set_sample_width(2)
+    if gain:
+        sound = sound.apply_gain(gain)
+    if frame_rate is not None:
+        sound = sound.set_frame_rate(frame_rate)
+    if channels is not None:
+        sound = sound.set_channels(channels)
+
+    # Kept as int16, it only gets widened when added onto a beat
+    arr = np.frombuffer(sound.raw_data, dtype=np.int16).reshape(
+        -1, sound.channels)
+    return arr, sound.frame_rate, sound.channels
 
+
+def _mix_numpy(buf, sound, sample_offsets):
+    """
+    Adds `sound` onto `buf` starting at each of `sample_offsets`. Sounds
+    starting before the start (a negative offset) or running past the end of
+    `buf` get cut off.
+    """
+    for sample_offset in sample_offsets:
+        first = max(0, -sample_offset)
+        last = min(sound.shape[0], buf.shape[0] - sample_offset)
+        if last > first:
+            buf[sample_offset + first:sample_offset + last] += sound[first:last]
+
+
+def _mix_loops(buf, sound, sample_offsets):
+    """
+    Same as _mix_numpy but written as plain loops for Numba to compile. Each
+    hit is added as one flat run of samples (both arrays are C ordered) so
+    the loop can be vectorized.
+    """
+    channels = buf.shape[1]
+    flat_buf = buf.reshape(-1)
+    flat_sound = sound.reshape(-1)
+    for k in range(sample_offsets.shape[0]):
+        sample_offset = sample_offsets[k]
+        first = max(0, -sample_offset)
+        last = min(sound.shape[0], buf.shape[0] - sample_offset)
+        if last <= first:
+            continue
+
+        dst = flat_buf[(sample_offset + first) * channels:
+                       (sample_offset + last) * channels]
+        src = flat_sound[first * channels:last * channels]
+        for i in range(src.shape[0]):
+            dst[i] += src[i]
+
+
+def _to_int16_numpy(buf, out):
+    """
+    Clips the int32 samples of `buf` to the range of int16 and writes them to
+    the int16 array `out`, which has the same shape. `buf` is clipped in
+    place.
+    """
+    np.clip(buf, -32768, 32767, out=buf)
+    out[...] = buf
+
+
+def _to_int16_loops(buf, out):
+    """
+    Same as _to_int16_numpy but written as plain loops for Numba to compile,
+    clipping and narrowing in one pass.
+    """
+    flat_buf = buf.reshape(-1)
+    flat_out = out.reshape(-1)
+    # Kept as int32 so the comparisons don't get widened to int64
+    low, high = np.int32(-32768), np.int32(32767)
+    for i in range(flat_buf.shape[0]):
+        sample = flat_buf[i]
+        if sample < low:
+            sample = low
+        elif sample > high:
+            sample = high
+        flat_out[i] = sample
+
+
+if njit is not None:
+    # Giving the signatures compiles the functions now rather than on the
+    # first beat made, and cache=True keeps them compiled between runs
+    _INT32_2D = types.Array(types.int32, 2, 'C')
+    _INT16_2D = types.Array(types.int16, 2, 'C')
+    # Oneshot arrays are made from bytes, which can't be written to
+    _READONLY_INT16_2D = types.Array(types.int16, 2, 'C', readonly=True)
+    _INT64_1D = types.Array(types.int64, 1, 'C')
+
+    # No GIL, so the threads of _mix_threaded can run at the same time. Adds
+    # onto a measure are int16, adds of a measure onto a beat are int32
+    _mix = njit([types.void(_INT32_2D, _READONLY_INT16_2D, _INT64_1D),
+                 types.void(_INT32_2D, _INT32_2D, _INT64_1D)],
+                cache=True, nogil=True, boundscheck=False)(_mix_loops)
+    _to_int16 = njit(types.void(_INT32_2D, _INT16_2D),
+                     cache=True, boundscheck=False)(_to_int16_loops)
+else:
+    _mix = _mix_numpy
+    _to_int16 = _to_int16_numpy
+
+
+def _mix_threaded(buf, sound, sample_offsets):
+    """
+    Same as _mix but long beats are split into a strip per CPU, each mixed on
+    its own thread. The strips don't overlap, so no two threads ever add to
+    the same samples.
+    """
+    if buf.size < _THREADED_MIN_SAMPLES:
+        _mix(buf, sound, sample_offsets)
+        return
+
+    num_strips = cpu_count() or 1
+    bounds = np.linspace(0, buf.shape[0], num_strips + 1).astype(np.int64)
+
+    def mix_strip(start, stop):
+        # Only the hits that land somewhere in this strip
+        in_strip = ((sample_offsets < stop) &
+                    (sample_offsets + sound.shape[0] > start))
+        _mix(buf[start:stop], sound, sample_offsets[in_strip] - start)
+
+    with ThreadPoolExecutor(num_strips) as executor:
+        # Go through the results so any errors get raised
+        list(executor.map(mix_strip, bounds[:-1], bounds[1:]))
+
+
+class BeatBoxer:
     def __init__(self, bpm=130, base_note=4, save_path=None):
         """
         Can be used to create and save a beat created by oneshots imported and
-        saved in self.oneshots.
+        saved in self.oneshots, a read-only dictionary of oneshot names to file
+        paths. Add to it with self.add_oneshot.
 
         Parameters:
         bpm - (default 130) The beats per minute to use
@@ -44,6 +200,15 @@ class BeatBoxer:
         self.current_beat = None
         self.stored_beats = {}
 
+        self._oneshot_paths = self._default_oneshots()
+        # Gain in dB of any oneshot that isn't played as is
+        self._oneshot_gains = {}
+        # The sample arrays of the oneshots, used when mixing down a beat, and
+        # their lengths in milliseconds
+        self._oneshot_arrays = {}
+        self._oneshot_len_ms = {}
+        self._sync_oneshots()
+
     def __str__(self):
         output = ''
         # Print out info of what is saved in current beat
@@ -54,19 +219,29 @@ class BeatBoxer:
                 '{}/{}'.format(self.current_beat['beats_per_measure'],
                                self.current_beat['base_note']),
                 self.current_beat['num_measures'],
-                round(self.current_beat['audio'].duration_seconds, 3))
+                round(self._beat_length(self.current_beat) / 1000, 3))
             output += '\n\n'
 
         # Print out info of what is saved in the stored beats
         if self.stored_beats:
-            # How much space to allocate for each thing to print out
+            # How much space to allocate for each thing to print out, found
+            # with one pass through the stored beats
+            name_len = bpm = beats_per_measure = base_note = num_measures = 0
+            durations = {}
+            for name, data in self.stored_beats.items():
+                durations[name] = self._beat_length(data) / 1000
+                name_len = max(name_len, len(name))
+                bpm = max(bpm, data['bpm'])
+                beats_per_measure = max(beats_per_measure,
+                                        data['beats_per_measure'])
+                base_note = max(base_note, data['base_note'])
+                num_measures = max(num_measures, data['num_measures'])
             template_lengths = [
-                max(map(len, self.stored_beats.keys())),
-                len(str(max([v['bpm'] for v in self.stored_beats.values()]))),
-                len(str(max([v['beats_per_measure'] for v in self.stored_beats.values()]))) +
-                len(str(max([v['base_note'] for v in self.stored_beats.values()]))) + 1,
-                len(str(max([v['num_measures'] for v in self.stored_beats.values()]))),
-                len(str(max([round(v['audio'].duration_seconds, 3) for v in self.stored_beats.values()])))
+                name_len,
+                len(str(bpm)),
+                len(str(beats_per_measure)) + len(str(base_note)) + 1,
+                len(str(num_measures)),
+                len(str(round(max(durations.values()), 3)))
             ]
 
             output += '---------Stored Beats--------\n'        
@@ -75,21 +250,66 @@ class BeatBoxer:
             for name, data in self.stored_beats.items():
                 output += template.format(*template_lengths, name, data['bpm'],
                     '{}/{}'.format(data['beats_per_measure'], data['base_note']),
-                    data['num_measures'], data['audio'].duration_seconds) + '\n'
+                    data['num_measures'], durations[name]) + '\n'
         return output
 
-    def add_oneshot(self, oneshot_path, name=None):
+    @property
+    def oneshots(self):
         """
-        Add one's own audio to the dictionary of oneshots.
+        A read-only view of the oneshots that can be used, mapping their names
+        to their file paths. Use self.add_oneshot to add to it.
+        """
+        return MappingProxyType(self._oneshot_paths)
+
+    def add_oneshot(self, oneshot_path, name=None, gain=0):
+        """
+        Add one's own audio to the dictionary of oneshots. The same file can
+        be added more than once under different names, e.g. to have a quieter
+        version of it with `gain`.
 
         Paramters:
         oneshot_path - Path to the audio file
         name - (default None) What to name the audio file in self.oneshots. By
                default, it will be the file name
+        gain - (default 0) Gain in dB to apply to the audio, negative to make
+               it quieter
         """
-        ftype = oneshot_path[-3:]
         name = name or oneshot_path.split(path.sep)[-1][:-4]
-        self.oneshots[name] = AudioSegment.from_file(oneshot_path, ftype)
+        self._oneshot_paths[name] = oneshot_path
+        self._oneshot_gains[name] = gain
+        self._sync_oneshots()
+
+    @classmethod
+    def _default_oneshots(cls):
+        """
+        Returns the dictionary of the oneshots that come with the package. They
+        are only loaded when a BeatBoxer object is made, not on import.
+        """
+        return {name: path.join(ONESHOT_PATH, name + '.wav')
+                for name in DEFAULT_ONESHOTS}
+
+    def _sync_oneshots(self):
+        """
+        Loads every oneshot in self.oneshots as an int16 sample array of shape
+        (frames, channels). All of the arrays share the highest frame rate and
+        number of channels of the oneshots, the same as pydub does when
+        overlaying segments.
+        """
+        gains = {name: self._oneshot_gains.get(name, 0)
+                 for name in self._oneshot_paths}
+        loaded = {name: _load_oneshot(oneshot_path, gain=gains[name])
+                  for name, oneshot_path in self._oneshot_paths.items()}
+        self._frame_rate = max(x[1] for x in loaded.values())
+        self._channels = max(x[2] for x in loaded.values())
+
+        for name, (arr, frame_rate, channels) in loaded.items():
+            # Only convert the oneshots that don't match
+            if (frame_rate, channels) != (self._frame_rate, self._channels):
+                arr = _load_oneshot(self._oneshot_paths[name], self._frame_rate,
+                                    self._channels, gains[name])[0]
+            self._oneshot_arrays[name] = arr
+            self._oneshot_len_ms[name] = round(
+                1000 * arr.shape[0] / self._frame_rate)
 
     def change_bpm(self, new_bpm):
         """
@@ -123,24 +343,23 @@ class BeatBoxer:
         """
         return [Mlist() for _ in range(num_beats)]
 
-    def _max_len(self, oneshots):
+    def _max_len(self, oneshots, oneshot_len_ms=None):
         """
-        From the list of oneshots, returns the length of the longest one
+        From the list of oneshots, returns the length of the longest one. The
+        lengths are looked up in `oneshot_len_ms`, by default
+        self._oneshot_len_ms
         """
-        if oneshots:
-            return max(map(lambda x: len(self.oneshots[x]), oneshots))
-        return 0
+        if oneshot_len_ms is None:
+            oneshot_len_ms = self._oneshot_len_ms
+        return max((oneshot_len_ms[x] for x in oneshots), default=0)
 
     def make_a_beat(self, measure, num_measures=9, repeatable=True,
                     _no_add=False, **shortcuts):
         """
-        Creates a beat from the list `measure`. This method works by creating
-        a silent 'canvas' of the appropriate length. Then, as it iterates
-        through the `measure` list, it will create an overlay of every oneshot
-        to be played (with silent buffers for the shorter oneshots) and this
-        overlay is overlayed the 'canvas' at the appropriate place with the
-        appropriate silent buffer to it. This way, oneshots of any length can
-        be used.
+        Creates a beat from the list `measure` and puts it in
+        self.current_beat. The audio of the beat isn't made until it is
+        needed, i.e. when it is played or saved. To get the audio as a pydub
+        AudioSegment, use self.get_audio.
 
         Parameters:
         measure - A list where each element gives the info on what oneshots
@@ -162,66 +381,116 @@ class BeatBoxer:
                     'single': {'hihat': [1, 2, 3], 'snare': [5, 9]}
                 (will add a hihat on the 1st, 2nd and 3rd beat and a snare on
                  the 5th and 9th beat)
+        """
+        if not _no_add:
+            # Make the additions to the template
+            measure = self._edit_template([Mlist(x) for x in measure], shortcuts)
+
+        # Check the oneshots now rather than when the beat is rendered
+        names = {beat_sound for beat_measure in measure
+                 for beat_sound in beat_measure}
+        unknown = names - self._oneshot_arrays.keys()
+        if unknown:
+            raise Exception('Unknown oneshot(s): {}. '.format(
+                ', '.join(sorted(unknown))) + 'Add them with add_oneshot.')
+
+        # Keep the oneshots as they are now, so adding a oneshot later on
+        # doesn't change a beat that has already been made
+        self.current_beat = {
+            'beats_per_measure': len(measure), 'bpm': self.bpm,
+            'num_measures': num_measures, 'base_note': self.base_note,
+            'measure': list(measure), 'repeatable': repeatable,
+            '_spb': self._spb, '_frame_rate': self._frame_rate,
+            '_channels': self._channels,
+            '_oneshot_arrays': {x: self._oneshot_arrays[x] for x in names},
+            '_oneshot_len_ms': {x: self._oneshot_len_ms[x] for x in names},
+            '_audio': None}
+
+    def _beat_length(self, beat):
+        """
+        Returns the length of `beat` in milliseconds, without rendering it.
+        """
+        beat_length = beat['_spb'] * len(beat['measure']) * beat['num_measures']
+        if not beat['repeatable']:
+            beat_length += self._max_len(beat['measure'][-1],
+                                         beat['_oneshot_len_ms'])
+        return beat_length
+
+    def get_audio(self, beat=None):
+        """
+        Returns the audio of the beat as a pydub AudioSegment, making it first
+        if it hasn't been yet.
+
+        Parameters:
+        beat - (default self.current_beat) The beat to get the audio of
+        """
+        beat = beat or self.current_beat
+        if beat['_audio'] is None:
+            beat['_audio'] = self._render(beat)
+        return beat['_audio']
+
+    def _render(self, beat):
+        """
+        Creates the audio of `beat`. This method works by creating a silent
+        'canvas' of samples of the appropriate length. Then, as it iterates
+        through the measure, it will add the samples of every oneshot to be
+        played onto the 'canvas' at the appropriate place. The canvas is only
+        turned into audio once everything has been added. This way, oneshots
+        of any length can be used.
         """
             ## Here's a list of what each variable is ##
         ### Cause I KNOW I will forget... I'm not THAT naive ###
-        # beat - the output (used colloquially rather than musically)
         # beat_length - the length of the entire beat
         # beat_measure - an element of the measure list
         # beat_sound - an element of a beat (since there can be multiple sounds
         #              per beat)
-        # combined_beat_sounds - an audio of all the sounds we want overlayed
-        #                        for the current beat
+        # buf - the int32 samples of the beat that every sound is added to
+        # hits - which beats of the measure each beat_sound is played on
         # ind_beat - which beat we are on
-        # ind_measure - which measure we are on
-        # max_len - length of longest oneshot of beat_measure
+        # ind_beats - every ind_beat that a beat_sound is played on
         # measure - list of what each beat in the measure should play
+        # measure_buf - the int32 samples of a single measure, including the
+        #               sounds ringing out past its end
         # measure_length - the time length of one measure
-        # num_measures - how many times to repeat the measure
-        # offset - The time offset at which the current beat should start
-        # sound - the actuall AudioSegment object of beat_sound
+        # offsets - The time offsets at which every hit of a beat_sound should
+        #           start in a measure, or at which every measure should start
+        # spb - the milliseconds per beat of the beat
             ##                  End                      ##
-        if not _no_add:
-            # Make the additions to the template
-            measure = self._edit_template([Mlist(x) for x in measure], **shortcuts)
+        measure, spb = beat['measure'], beat['_spb']
+        oneshot_arrays = beat['_oneshot_arrays']
 
         # Total length of final audio file
-        measure_length = self._spb * len(measure)
-        beat_length = measure_length * num_measures
-        beat = AudioSegment.silent(beat_length)
-        if not repeatable:
-            beat += AudioSegment.silent(self._max_len(measure[-1]))
-
-        # Repeat for `num_measures` measures
-        for ind_measure in range(num_measures):
-            # Run through each beat of the measure
-            for ind_beat, beat_measure in enumerate(measure):
-                # If not to play anything on this `beat_measure`
-                if not beat_measure:
-                    continue
-                # Find longest oneshot, so to add silence to shorter oneshots
-                max_len = self._max_len(beat_measure)
-
-                # Time at which this beat starts
-                offset = ind_measure * measure_length + ind_beat * self._spb
-
-                combined_beat_sounds = AudioSegment.silent(max_len)
-                for beat_sound in beat_measure:
-                    sound = self.oneshots[beat_sound]
-
-                    # Overlay each sound, with silent padding if necessary
-                    combined_beat_sounds = combined_beat_sounds.overlay(
-                        sound + AudioSegment.silent(max_len - len(sound)))
-
-                # Add beat at its offset with a silent padding
-                beat = beat.overlay(combined_beat_sounds +
-                    AudioSegment.silent(beat_length - max_len - offset),
-                    position=offset)
-
-        self.current_beat = {
-            'audio': beat, 'beats_per_measure': len(measure), 'bpm': self.bpm,
-            'num_measures': num_measures, 'base_note': self.base_note,
-            'measure': list(measure), 'repeatable': repeatable}
+        measure_length = spb * len(measure)
+        beat_length = self._beat_length(beat)
+
+        fr, ch = beat['_frame_rate'], beat['_channels']
+        buf = np.zeros((int(beat_length * fr / 1000), ch), dtype=np.int32)
+
+        # Find which beats each oneshot is played on
+        hits = defaultdict(list)
+        for ind_beat, beat_measure in enumerate(measure):
+            for beat_sound in beat_measure:
+                hits[beat_sound].append(ind_beat)
+
+        # Render a single measure, long enough for every sound to ring out
+        measure_buf = np.zeros((int(measure_length * fr / 1000) + max(
+            (oneshot_arrays[x].shape[0] for x in hits), default=0),
+            ch), dtype=np.int32)
+        for beat_sound, ind_beats in hits.items():
+            offsets = np.array(ind_beats, dtype=np.int64) * spb
+            _mix(measure_buf, oneshot_arrays[beat_sound],
+                 (offsets * fr // 1000).astype(np.int64))
+
+        # Every measure is the same, so add the rendered measure at the start
+        # of each one rather than adding every sound of every measure
+        offsets = np.arange(beat['num_measures'], dtype=np.int64) * measure_length
+        _mix_threaded(buf, measure_buf, (offsets * fr // 1000).astype(np.int64))
+
+        out = np.empty(buf.shape, dtype=np.int16)
+        _to_int16(buf, out)
+        # pydub needs the audio as immutable bytes
+        return AudioSegment(data=out.tobytes(), sample_width=2, frame_rate=fr,
+                            channels=ch)
 
     def play_beat(self, beat=None):
         """
@@ -231,7 +500,7 @@ class BeatBoxer:
         beat - (default self.current_beat) The beat to play
         """
         beat = beat or self.current_beat
-        play(beat['audio'])
+        play(self.get_audio(beat))
 
     def save_beat(self, name, beat=None, ftype='wav', save_path=None):
         """
@@ -253,7 +522,21 @@ class BeatBoxer:
             makedirs(save_path)
 
         beat = beat or self.current_beat
-        beat['audio'].export(path.join(save_path, name + '.' + ftype), format=ftype)
+        audio = self.get_audio(beat)
+        file_path = path.join(save_path, name + '.' + ftype)
+        if soundfile is not None and ftype.upper() in soundfile.available_formats():
+            # Write the samples straight out rather than through pydub, which
+            # needs ffmpeg for anything but WAV
+            samples = np.frombuffer(audio.raw_data, dtype=np.int16).reshape(
+                -1, audio.channels)
+            # Keep the samples as 16 bit where the format can, e.g. RAW has no
+            # default subtype. Formats like OGG need their own
+            subtype = 'PCM_16' if soundfile.check_format(
+                ftype.upper(), 'PCM_16') else None
+            soundfile.write(file_path, samples, audio.frame_rate,
+                            subtype=subtype, format=ftype.upper())
+        else:
+            audio.export(file_path, format=ftype)
 
     def store_beat(self, name):
         """
@@ -305,11 +588,11 @@ class BeatBoxer:
         old_base_note = self.base_note
         self.change_base_note(base_note)
 
-        # Get the template
-        measure = self.current_beat['measure']
+        # Get a copy of the template, the original can still be used by a
+        # stored beat
+        measure = [Mlist(x) for x in self.current_beat['measure']]
 
-        self._edit_template(measure, **add)
-        self._edit_template(measure, 'remove', **remove)
+        self._edit_template(measure, add, remove)
         self.make_a_beat(measure, num_measures or self.current_beat['num_measures'],
             repeatable or self.current_beat['repeatable'], True)
 
@@ -317,34 +600,42 @@ class BeatBoxer:
         self.change_bpm(old_bpm)
         self.change_base_note(old_base_note)
 
-    def _edit_template(self, measure, etype='append', **shortcuts):
+    def _edit_template(self, measure, adds=None, removes=None):
         """
-        Add or remove notes according to the shortcuts to measure.
-        """
-        if etype not in ['append', 'remove']:
-            raise Exception('Unknown edit type: {}.'.format(etype))
+        Add and remove notes according to the shortcuts to measure. Every
+        note is added before any are removed.
 
-        # Go through the kwargs
-        for shortcut in shortcuts:
-            # Edits oneshots for every beat
-            if shortcut == 'every_beat':
-                for ind_beat in range(len(measure)):
-                    for oneshot in shortcuts[shortcut]:
-                        measure[ind_beat].cchange(oneshot, etype)
-            # Edits oneshots on every nth beat
-            elif re.findall('every_(\d+)(?:st|nd|rd|th)', shortcut):
-                nth = int(re.findall('every_(\d+)(?:st|nd|rd|th)', shortcut)[0])
-                for ind_beat in range(len(measure)):
+        Parameters:
+        measure - The template to edit
+        adds - (default None) A dictionary of notes to add. The syntax follows
+               exactly from **shortcuts from self.make_a_beat
+        removes - (default None) Same as `adds` but removes notes
+        """
+        for shortcuts, etype in ((adds or {}, 'append'),
+                                 (removes or {}, 'remove')):
+            # Go through the shortcuts
+            for shortcut in shortcuts:
+                every_nth = _EVERY_NTH.match(shortcut)
+                # Edits oneshots for every beat
+                if shortcut == 'every_beat':
+                    for ind_beat in range(len(measure)):
+                        for oneshot in shortcuts[shortcut]:
+                            measure[ind_beat].cchange(oneshot, etype)
+                # Edits oneshots on every nth beat
+                elif every_nth:
+                    nth = int(every_nth.group(1))
                     for oneshot in shortcuts[shortcut]:
                         # An offset of m will start on the (m+1)th beat and be
-                        # repeated every nth beat
-                        if ind_beat >= oneshot[1] and not (ind_beat - oneshot[1]) % nth:
+                        # repeated every nth beat. A negative one starts on
+                        # the first beat it would have reached
+                        start = oneshot[1] if oneshot[1] >= 0 else oneshot[1] % nth
+                        for ind_beat in range(start, len(measure), nth):
                             measure[ind_beat].cchange(oneshot[0], etype)
-            # Edits oneshots on specific beats
-            elif shortcut == 'single':
-                for oneshot, ind_beats in shortcuts['single'].items():
-                    for ind_beat in ind_beats:
-                        measure[ind_beat].cchange(oneshot, etype)
+                # Edits oneshots on specific beats
+                elif shortcut == 'single':
+                    for oneshot, ind_beats in shortcuts['single'].items():
+                        for ind_beat in ind_beats:
+                            measure[ind_beat].cchange(oneshot, etype)
 
         return measure
 
@@ -410,6 +701,13 @@ def main():
         every_3rd=[('snare', 2), ('kick', 1)])
     b.store_beat('lastly dope')
 
+    # The BPM doesn't have to be a whole number
+    b.change_bpm(92.5)
+    b.make_a_beat(b.empty(4), num_measures=2, every_beat=['hihat'],
+        every_2nd=[('kick', 0), ('snare', 1)])
+    b.save_beat('off the grid')
+    b.change_bpm(100)
+
     # Save one of the beats
     b.save_beat('dopest', b.stored_beats['dope2'])
 
@@ -26,6 +26,7 @@ setup(
     long_description=long_description,
     long_description_content_type='text/markdown',
     install_requires=requirements,
+    extras_require={'fast': ['numba>=0.47', 'soundfile>=0.10']},
     package_data={'beatboxer': [
         'samples/bass.wav',
         'samples/clap.wav',